@@ -1,9 +1,13 @@
 import boto3
-import pandas as pd
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pyarrow as pa
+import pyarrow.parquet as pq
 import io
-from datetime import datetime
+import calendar
+from datetime import datetime, date
+from functools import lru_cache
 import re
-from dateutil.relativedelta import relativedelta
 import os
 
 # Try to load dotenv for local development, but don't fail if not available
@@ -15,6 +19,30 @@ try:
 except ImportError:
     print("[LOG] Running in Lambda with environment variables")
 
+# Parquet files are fetched concurrently; size the connection pool to match the workers
+MAX_WORKERS = 16
+S3_CLIENT_CONFIG = Config(max_pool_connections=32)
+
+# Parquet files end with <footer><4-byte footer length>PAR1; one GET of this
+# many trailing bytes almost always covers the whole footer
+FOOTER_READ_SIZE = 64 * 1024
+PARQUET_MAGIC = b'PAR1'
+
+# Oversized footers are fetched as several concurrent ranges instead of one stream
+FOOTER_SPLIT_THRESHOLD = 1024 * 1024
+FOOTER_SPLIT_PARTS = 4
+
+# Matches the dartmouth_db.data_ingestion_map table definition
+MAP_SCHEMA = pa.schema([
+    ('src_filename', pa.string()),
+    ('ingestion_date', pa.date32()),
+    ('upload_timestamp', pa.timestamp('us', tz='UTC')),
+    ('file_path', pa.string()),
+    ('record_count', pa.int32()),
+    ('metric_type', pa.string()),
+    ('status', pa.string())
+])
+
 def get_s3_client():
     """Returns appropriate S3 client based on environment"""
     is_lambda = (
@@ -25,64 +53,58 @@ def get_s3_client():
     
     if is_lambda:
         print("[LOG] Detected Lambda environment - Using IAM role for S3 access")
-        return boto3.client('s3')
+        return boto3.client('s3', config=S3_CLIENT_CONFIG)
     else:
         print("[LOG] Running locally, checking for credentials")
         aws_key = os.getenv('AWS_ACCESS_KEY_ID')
         aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
         if aws_key and aws_secret:
             print("[LOG] Using credentials from environment variables")
-            return boto3.client('s3', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret)
+            return boto3.client('s3', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret, config=S3_CLIENT_CONFIG)
         else:
             print("[LOG] Using default AWS configuration")
-            return boto3.client('s3')
+            return boto3.client('s3', config=S3_CLIENT_CONFIG)
+
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+# Markers that start the metric part of a parquet filename
+_METRIC_PATTERNS = (
+    'value_weight', 'equal_weight', 'number_', 'average_',
+    'sum_', 'net_stock'
+)
+
+# <month><yy>_<source name>[_<metric>].parquet, parsed in one match; the lazy
+# source group makes the metric start at the leftmost marker
+_FILENAME_RE = re.compile(
+    r'^(?P<src>(?P<month>' + '|'.join(_MONTHS) + r')(?P<year>\d{2})_.*?)'
+    r'(?:_(?P<metric>(?:' + '|'.join(_METRIC_PATTERNS) + r').*?))?\.parquet$',
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=None)
+def month_end_date(full_year, month_num):
+    """Last day of the given month"""
+    return date(full_year, month_num, calendar.monthrange(full_year, month_num)[1])
 
 def extract_metadata_from_filename(filename):
     """Extract ingestion date, source filename, and metric from parquet filename"""
     # Example: july17_6_Portfolios_2x3_value_weighted_return.parquet
     
-    # Extract month and year for ingestion date
-    months = {
-        'january': 1, 'february': 2, 'march': 3, 'april': 4,
-        'may': 5, 'june': 6, 'july': 7, 'august': 8,
-        'september': 9, 'october': 10, 'november': 11, 'december': 12
-    }
-    
-    filename_lower = filename.lower()
-    
-    ingestion_date = None
-    for month_name, month_num in months.items():
-        if month_name in filename_lower:
-            year_match = re.search(r'(\d{2})', filename_lower)
-            if year_match:
-                year = int(year_match.group(1))
-                full_year = 1900 + year if year > 50 else 2000 + year
-                
-                date = datetime(full_year, month_num, 1)
-                date = date + relativedelta(months=1) - relativedelta(days=1)
-                ingestion_date = date.date()
-                break
-    
-    # Extract metric type (everything after the last underscore before .parquet)
-    # Split by common metric patterns
-    metric_patterns = [
-        '_value_weight', '_equal_weight', '_number_', '_average_',
-        '_sum_', '_net_stock'
-    ]
-    
-    metric_type = 'unknown'
-    for pattern in metric_patterns:
-        if pattern in filename_lower:
-            idx = filename_lower.index(pattern) + 1  # +1 to skip the underscore
-            metric_type = filename[idx:].replace('.parquet', '')
-            break
-    
-    # Extract source filename (everything before the metric type)
-    src_filename = filename
-    for pattern in metric_patterns:
-        if pattern in filename_lower:
-            src_filename = filename[:filename_lower.index(pattern)]
-            break
+    match = _FILENAME_RE.match(filename)
+    if match is None:
+        print(f"[WARN] Unrecognised parquet filename: {filename}")
+        return filename + '.CSV', None, 'unknown'
+    
+    year = int(match['year'])
+    full_year = 1900 + year if year > 50 else 2000 + year
+    ingestion_date = month_end_date(full_year, _MONTHS[match['month'].lower()])
+    
+    src_filename = match['src']
+    metric_type = match['metric'] or 'unknown'
     
     # Add .CSV extension if not present
     if not src_filename.upper().endswith('.CSV'):
@@ -90,6 +112,84 @@ def extract_metadata_from_filename(filename):
     
     return src_filename, ingestion_date, metric_type
 
+def fetch_range(s3_client, bucket_name, key, start, end):
+    """Fetch bytes [start, end) of an S3 object"""
+    response = s3_client.get_object(Bucket=bucket_name, Key=key, Range=f'bytes={start}-{end - 1}')
+    return response['Body'].read()
+
+def fetch_range_parallel(s3_client, bucket_name, key, start, end):
+    """Fetch bytes [start, end), splitting spans over FOOTER_SPLIT_THRESHOLD into concurrent GETs"""
+    if end - start <= FOOTER_SPLIT_THRESHOLD:
+        return fetch_range(s3_client, bucket_name, key, start, end)
+    
+    part_size = -(-(end - start) // FOOTER_SPLIT_PARTS)
+    ranges = [(part_start, min(part_start + part_size, end)) for part_start in range(start, end, part_size)]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        parts = pool.map(lambda r: fetch_range(s3_client, bucket_name, key, r[0], r[1]), ranges)
+        return b''.join(parts)
+
+def read_footer_num_rows(s3_client, bucket_name, key, size):
+    """Read a parquet file's row count from its footer without downloading the data pages"""
+    start = max(0, size - FOOTER_READ_SIZE)
+    tail = fetch_range(s3_client, bucket_name, key, start, size)
+    if tail[-4:] != PARQUET_MAGIC:
+        raise ValueError(f"{key} is not a parquet file")
+    
+    footer_length = int.from_bytes(tail[-8:-4], 'little')
+    footer_start = size - 8 - footer_length
+    if footer_start < 4:
+        raise ValueError(f"{key} has an invalid footer length {footer_length}")
+    if footer_start < start:
+        # Rare oversized footer: fetch the part the first read missed
+        tail = fetch_range_parallel(s3_client, bucket_name, key, footer_start, start) + tail
+        start = footer_start
+    
+    # Only the footer is needed to parse metadata, so frame it as a minimal parquet file
+    footer = PARQUET_MAGIC + tail[footer_start - start:]
+    return pq.ParquetFile(io.BytesIO(footer)).metadata.num_rows
+
+def fetch_and_parse(s3_client, bucket_name, obj):
+    """Read record count and filename metadata for one listed parquet object.
+    
+    Returns one ingestion map row as a tuple in MAP_SCHEMA column order.
+    """
+    file_key = obj['Key']
+    filename = file_key.split('/')[-1]
+    
+    print(f"[LOG] Processing {filename}")
+    
+    try:
+        # Row count comes from the parquet footer; only the file tail is fetched
+        record_count = read_footer_num_rows(s3_client, bucket_name, file_key, obj['Size'])
+        status = 'success'
+        
+    except Exception as e:
+        print(f"[ERROR] Failed to read {filename}: {e}")
+        record_count = 0
+        status = 'failed'
+    
+    # Extract metadata from filename
+    try:
+        src_filename, ingestion_date, metric_type = extract_metadata_from_filename(filename)
+    except Exception as e:
+        print(f"[ERROR] Failed to extract metadata from {filename}: {e}")
+        src_filename = filename
+        ingestion_date = datetime.now().date()
+        metric_type = 'unknown'
+        status = 'metadata_extraction_failed'
+    
+    print(f"[LOG] {filename}: {record_count} records, ingestion_date={ingestion_date}, metric={metric_type}")
+    
+    return (
+        src_filename,
+        ingestion_date,
+        obj['LastModified'],
+        f's3://{bucket_name}/{file_key}',
+        record_count,
+        metric_type,
+        status
+    )
+
 def lambda_handler(event, context):
     s3_client = get_s3_client()
     bucket_name = "dartmouth-etl"
@@ -101,14 +201,16 @@ def lambda_handler(event, context):
         
         # List all parquet files
         paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket_name, Prefix=transformed_folder)
+        pages = paginator.paginate(
+            Bucket=bucket_name,
+            Prefix=f"{transformed_folder}/",
+            PaginationConfig={'PageSize': 1000}
+        )
         
-        parquet_files = []
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    if obj['Key'].endswith('.parquet'):
-                        parquet_files.append(obj)
+        parquet_files = [
+            obj for page in pages for obj in page.get('Contents', [])
+            if obj['Key'].endswith('.parquet')
+        ]
         
         if len(parquet_files) == 0:
             print("[WARN] No parquet files found")
@@ -119,86 +221,54 @@ def lambda_handler(event, context):
         
         print(f"[LOG] Found {len(parquet_files)} parquet files")
         
-        map_data = []
+        # One list per output column, fed straight into the Arrow table
+        map_columns = {name: [] for name in MAP_SCHEMA.names}
+        
+        # S3 clients are thread-safe, so all workers share the one client
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = [
+                pool.submit(fetch_and_parse, s3_client, bucket_name, obj)
+                for obj in parquet_files
+            ]
+            for future in as_completed(futures):
+                for column, value in zip(map_columns.values(), future.result()):
+                    column.append(value)
         
-        for obj in parquet_files:
-            file_key = obj['Key']
-            filename = file_key.split('/')[-1]
-            
-            print(f"[LOG] Processing {filename}")
-            
-            try:
-                # Download and read parquet to get record count
-                response = s3_client.get_object(Bucket=bucket_name, Key=file_key)
-                parquet_content = response['Body'].read()
-                
-                df = pd.read_parquet(io.BytesIO(parquet_content))
-                record_count = len(df)
-                status = 'success'
-                
-            except Exception as e:
-                print(f"[ERROR] Failed to read {filename}: {e}")
-                record_count = 0
-                status = 'failed'
-            
-            # Extract metadata from filename
-            try:
-                src_filename, ingestion_date, metric_type = extract_metadata_from_filename(filename)
-            except Exception as e:
-                print(f"[ERROR] Failed to extract metadata from {filename}: {e}")
-                src_filename = filename
-                ingestion_date = datetime.now().date()
-                metric_type = 'unknown'
-                status = 'metadata_extraction_failed'
-            
-            map_data.append({
-                'src_filename': src_filename,
-                'ingestion_date': ingestion_date,
-                'upload_timestamp': obj['LastModified'],
-                'file_path': f's3://{bucket_name}/{file_key}',
-                'record_count': record_count,
-                'metric_type': metric_type,
-                'status': status
-            })
-            
-            print(f"[LOG] {filename}: {record_count} records, ingestion_date={ingestion_date}, metric={metric_type}")
+        entry_count = len(map_columns['file_path'])
+        statuses = map_columns['status']
+        total_records = sum(map_columns['record_count'])
         
-        if len(map_data) == 0:
+        if entry_count == 0:
             print("[WARN] No metadata extracted")
             return {
                 'statusCode': 200,
                 'message': 'No metadata to write'
             }
         
-        # Create DataFrame and write to S3
-        map_df = pd.DataFrame(map_data)
-        
-        # Ensure proper data types
-        map_df['ingestion_date'] = pd.to_datetime(map_df['ingestion_date'])
-        map_df['upload_timestamp'] = pd.to_datetime(map_df['upload_timestamp'])
+        # Build the Arrow table directly from the column lists and write to S3
+        map_table = pa.table(map_columns, schema=MAP_SCHEMA)
         
         output_key = f"{output_folder}/ingestion_map.parquet"
         parquet_buffer = io.BytesIO()
-        map_df.to_parquet(parquet_buffer, index=False)
-        parquet_buffer.seek(0)
+        pq.write_table(map_table, parquet_buffer, compression='zstd')
         
         s3_client.put_object(Bucket=bucket_name, Key=output_key, Body=parquet_buffer.getvalue())
         
         print(f"[LOG] Ingestion map written to {output_key}")
-        print(f"[LOG] Total entries: {len(map_data)}")
+        print(f"[LOG] Total entries: {entry_count}")
         
         # Print summary
         print("\n[SUMMARY]")
         print(f"Total parquet files: {len(parquet_files)}")
-        print(f"Successfully processed: {sum(1 for x in map_data if x['status'] == 'success')}")
-        print(f"Failed: {sum(1 for x in map_data if x['status'] != 'success')}")
-        print(f"Total records: {sum(x['record_count'] for x in map_data)}")
+        print(f"Successfully processed: {statuses.count('success')}")
+        print(f"Failed: {entry_count - statuses.count('success')}")
+        print(f"Total records: {total_records}")
         
         return {
             'statusCode': 200,
-            'message': f'Created ingestion map with {len(map_data)} entries',
+            'message': f'Created ingestion map with {entry_count} entries',
             'output_path': f's3://{bucket_name}/{output_key}',
-            'total_records': sum(x['record_count'] for x in map_data)
+            'total_records': total_records
         }
     
     except Exception as e:
@@ -1,6 +1,11 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 import zipfile
+import zlib
 import io
+from collections import OrderedDict
 from datetime import datetime
 import re
 import os
@@ -14,6 +19,26 @@ try:
 except ImportError:
     print("[LOG] Running in Lambda with environment variables")
 
+# Use ISA-L's SIMD inflate when python-isal is installed. zipfile looks up
+# zlib.decompressobj on every member it opens, so this covers all extraction.
+try:
+    from isal import isal_zlib
+    zlib.decompressobj = isal_zlib.decompressobj
+    print("[LOG] Using ISA-L accelerated inflate")
+except ImportError:
+    print("[LOG] python-isal not installed, using stock zlib")
+
+# Zips are processed concurrently and each zip uploads its CSVs concurrently,
+# so the shared client needs enough connections for both pools
+ZIP_WORKERS = 8
+UPLOAD_WORKERS = 16
+S3_CLIENT_CONFIG = Config(max_pool_connections=64, retries={'mode': 'adaptive'})
+
+# CSVs are inflated and uploaded in 8 MiB parts rather than held whole in memory
+UPLOAD_CONFIG = TransferConfig(
+    multipart_chunksize=8 * 1024 * 1024
+)
+
 def get_s3_client():
     """Returns appropriate S3 client based on environment"""
     # Check multiple Lambda environment indicators
@@ -26,7 +51,7 @@ def get_s3_client():
     if is_lambda:
         # Lambda - use IAM role only
         print("[LOG] Detected Lambda environment - Using IAM role for S3 access")
-        return boto3.client('s3')
+        return boto3.client('s3', config=S3_CLIENT_CONFIG)
     else:
         # Local - use credentials if available
         print("[LOG] Running locally, checking for credentials")
@@ -34,10 +59,168 @@ def get_s3_client():
         aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
         if aws_key and aws_secret:
             print("[LOG] Using credentials from environment variables")
-            return boto3.client('s3', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret)
+            return boto3.client('s3', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret, config=S3_CLIENT_CONFIG)
         else:
             print("[LOG] Using default AWS configuration")
-            return boto3.client('s3')
+            return boto3.client('s3', config=S3_CLIENT_CONFIG)
+
+class S3RangeReader(io.RawIOBase):
+    """Seekable read-only file over an S3 object that fetches bytes with ranged GETs"""
+    TAIL_SIZE = 64 * 1024  # covers the end-of-central-directory record and, usually, the directory itself
+    BLOCK_SIZE = 1024 * 1024
+    MAX_BLOCKS = 16
+    
+    def __init__(self, s3_client, bucket_name, key):
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.size = s3_client.head_object(Bucket=bucket_name, Key=key)['ContentLength']
+        self.position = 0
+        self.tail_start = max(0, self.size - self.TAIL_SIZE)
+        self.tail = None
+        self.blocks = OrderedDict()
+    
+    def __len__(self):
+        return self.size
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        
+        self.position = position
+        return self.position
+    
+    def fetch_range(self, start, end):
+        """Fetch bytes [start, end) of the object"""
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name, Key=self.key, Range=f'bytes={start}-{end - 1}'
+        )
+        return response['Body'].read()
+    
+    def read_block(self, index):
+        """Return one BLOCK_SIZE-aligned block, keeping the most recently used ones cached"""
+        if index in self.blocks:
+            self.blocks.move_to_end(index)
+            return self.blocks[index]
+        
+        start = index * self.BLOCK_SIZE
+        block = self.fetch_range(start, min(start + self.BLOCK_SIZE, self.size))
+        self.blocks[index] = block
+        if len(self.blocks) > self.MAX_BLOCKS:
+            self.blocks.popitem(last=False)
+        return block
+    
+    def read(self, size=-1):
+        start = self.position
+        end = self.size if size is None or size < 0 else min(self.size, start + size)
+        if start >= end:
+            return b''
+        
+        if start >= self.tail_start:
+            if self.tail is None:
+                self.tail = self.fetch_range(self.tail_start, self.size)
+            data = self.tail[start - self.tail_start:end - self.tail_start]
+        elif end - start > self.BLOCK_SIZE:
+            # Large reads go straight to S3 rather than through the block cache
+            data = self.fetch_range(start, end)
+        else:
+            chunks = []
+            for index in range(start // self.BLOCK_SIZE, (end - 1) // self.BLOCK_SIZE + 1):
+                block_start = index * self.BLOCK_SIZE
+                block = self.read_block(index)
+                chunks.append(block[max(start, block_start) - block_start:end - block_start])
+            data = b''.join(chunks)
+        
+        self.position += len(data)
+        return data
+    
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+class MemberStream(io.RawIOBase):
+    """Forward-only, non-seekable view of an open zip member"""
+    def __init__(self, src):
+        super().__init__()
+        self.src = src
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        data = self.src.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def upload_csv(s3_client, bucket_name, s3_key, zf, fname):
+    """Stream one CSV member out of the zip to S3 and return its key"""
+    print(f"[LOG] Uploading: {s3_key}")
+    with zf.open(fname) as src:
+        # Hide seek: upload_fileobj would otherwise size the member by inflating it twice
+        s3_client.upload_fileobj(MemberStream(src), bucket_name, s3_key, Config=UPLOAD_CONFIG)
+    print(f"[SUCCESS] {s3_key.split('/')[-1]}")
+    return s3_key
+
+def process_zip(s3_client, bucket_name, zip_key, csv_folder):
+    """Extract every CSV in one zip to csv_folder and return the uploaded keys"""
+    print(f"\n[LOG] Processing: {zip_key}")
+    
+    # Extract year
+    year_match = re.search(r'(\d{4})', zip_key)
+    year_suffix = year_match.group(1)[-2:] if year_match else "00"
+    
+    month_prefix = "july"
+    
+    prefix = f"{month_prefix}{year_suffix}_"
+    print(f"[LOG] Prefix: {prefix}")
+    
+    try:
+        # Open zip in place; only the central directory and CSV members are fetched
+        print(f"[LOG] Opening {zip_key}")
+        zip_reader = S3RangeReader(s3_client, bucket_name, zip_key)
+        print(f"[LOG] Size: {len(zip_reader)} bytes")
+        
+        # Extract, streaming each CSV member to S3 from the upload pool
+        with zipfile.ZipFile(zip_reader) as zf, \
+                ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            uploads = []
+            for file_info in zf.filelist:
+                fname = file_info.filename
+                print(f"[LOG] Checking: {fname}")
+                
+                if fname.upper().endswith('.CSV'):
+                    csv_name = fname.split('/')[-1]
+                    new_name = f"{prefix}{csv_name}"
+                    s3_key = f"{csv_folder}/{new_name}"
+                    uploads.append(pool.submit(upload_csv, s3_client, bucket_name, s3_key, zf, fname))
+            
+            return [upload.result() for upload in uploads]
+    
+    except Exception as e:
+        print(f"[ERROR] {zip_key}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return []
 
 def lambda_handler(event, context):
     s3_client = get_s3_client()
@@ -70,48 +253,9 @@ def lambda_handler(event, context):
             print("[ERROR] No zip files found")
             return {'statusCode': 400, 'body': 'No zip files found'}
         
-        extracted_files = []
-        
-        for zip_key in zip_files:
-            print(f"\n[LOG] Processing: {zip_key}")
-            
-            # Extract year
-            year_match = re.search(r'(\d{4})', zip_key)
-            year_suffix = year_match.group(1)[-2:] if year_match else "00"
-            
-            month_prefix = "july"
-            
-            prefix = f"{month_prefix}{year_suffix}_"
-            print(f"[LOG] Prefix: {prefix}")
-            
-            try:
-                # Download zip
-                print(f"[LOG] Downloading {zip_key}")
-                response = s3_client.get_object(Bucket=bucket_name, Key=zip_key)
-                zip_data = response['Body'].read()
-                print(f"[LOG] Size: {len(zip_data)} bytes")
-                
-                # Extract
-                with zipfile.ZipFile(io.BytesIO(zip_data)) as zf:
-                    for file_info in zf.filelist:
-                        fname = file_info.filename
-                        print(f"[LOG] Checking: {fname}")
-                        
-                        if fname.upper().endswith('.CSV'):
-                            content = zf.read(fname)
-                            csv_name = fname.split('/')[-1]
-                            new_name = f"{prefix}{csv_name}"
-                            s3_key = f"{csv_folder}/{new_name}"
-                            
-                            print(f"[LOG] Uploading: {s3_key}")
-                            s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=content)
-                            extracted_files.append(s3_key)
-                            print(f"[SUCCESS] {new_name}")
-            
-            except Exception as e:
-                print(f"[ERROR] {zip_key}: {str(e)}")
-                import traceback
-                traceback.print_exc()
+        with ThreadPoolExecutor(max_workers=ZIP_WORKERS) as pool:
+            results = pool.map(lambda zip_key: process_zip(s3_client, bucket_name, zip_key, csv_folder), zip_files)
+            extracted_files = [s3_key for keys in results for s3_key in keys]
         
         print(f"\n[SUMMARY] Extracted {len(extracted_files)} files")
         return {
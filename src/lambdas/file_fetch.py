@@ -1,7 +1,12 @@
 import urllib.request
+import csv
+import io
 import urllib.parse
 from html.parser import HTMLParser
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 import os
 from datetime import datetime
 import hashlib
@@ -15,7 +20,37 @@ try:
 except ImportError:
     print("[LOG] Running in Lambda with environment variables")
 
+# Use lxml's C parser for the dataset page when it is installed. It is not part of
+# the Lambda runtime, so fall back to the stdlib parser when it isn't packaged.
+try:
+    from lxml import html as lxml_html
+    print("[LOG] Using lxml for dataset page parsing")
+except ImportError:
+    lxml_html = None
+    print("[LOG] lxml not installed, using html.parser")
+
+DOWNLOAD_WORKERS = 8
+
+# Zips are streamed from the HTTP response into a multipart upload in 8 MiB parts
+UPLOAD_CONFIG = TransferConfig(
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8
+)
+
+# Built once per container and shared by every download. boto3's default
+# credential chain covers the IAM role in Lambda and env vars / .env locally.
+# Every download worker can have a full set of UploadParts in flight at once,
+# so the pool holds one connection for each of them.
+_S3 = boto3.client('s3', config=Config(
+    max_pool_connections=DOWNLOAD_WORKERS * UPLOAD_CONFIG.max_request_concurrency,
+    retries={'mode': 'adaptive'}
+))
+
+# Anchors whose href ends in ".zip" and whose text is exactly "CSV"
+CSV_LINK_XPATH = '//a[substring(@href, string-length(@href) - 3) = ".zip" and normalize-space(.) = "CSV"]'
+
 class DatasetParser(HTMLParser):
+    """Stdlib equivalent of CSV_LINK_XPATH: .zip anchors whose text is exactly CSV"""
     def __init__(self):
         super().__init__()
         self.datasets = []
@@ -24,19 +59,17 @@ class DatasetParser(HTMLParser):
     
     def handle_starttag(self, tag, attrs):
         if tag == "a":
-            for attr, value in attrs:
-                if attr == "href" and value.endswith(".zip"):
-                    self.current_url = value
+            href = dict(attrs).get("href")
+            self.current_url = href if href and href.endswith(".zip") else None
+            self.current_text = ""
     
     def handle_data(self, data):
-        self.current_text += data.strip()
+        self.current_text += data
     
     def handle_endtag(self, tag):
         if tag == "a" and self.current_url:
-            text = self.current_text.strip()
-            if text == "CSV":
-                self.datasets.append({"name": self.current_text, "url": self.current_url})
-            self.current_text = ""
+            if " ".join(self.current_text.split()) == "CSV":
+                self.datasets.append({"name": "CSV", "url": self.current_url})
             self.current_url = None
 
 def fetch_datasets(url):
@@ -44,11 +77,16 @@ def fetch_datasets(url):
     with urllib.request.urlopen(url) as response:
         html = response.read().decode("utf-8")
     
-    parser = DatasetParser()
-    parser.feed(html)
-    print(f"[LOG] Total datasets found: {len(parser.datasets)}")
+    if lxml_html is not None:
+        tree = lxml_html.fromstring(html)
+        datasets = [{"name": "CSV", "url": a.get("href")} for a in tree.xpath(CSV_LINK_XPATH)]
+    else:
+        parser = DatasetParser()
+        parser.feed(html)
+        datasets = parser.datasets
+    print(f"[LOG] Total datasets found: {len(datasets)}")
     
-    filtered = [d for d in parser.datasets if any(str(year) in d["url"] for year in range(2017, 2030))]
+    filtered = [d for d in datasets if any(str(year) in d["url"] for year in range(2017, 2030))]
     print(f"[LOG] Filtered datasets (2017+): {len(filtered)}")
     for d in filtered:
         print(f"  - {d['url']}")
@@ -61,45 +99,23 @@ def extract_year(url):
     return "unknown"
 
 def generate_unique_filename(source_url):
-    hash_obj = hashlib.md5(source_url.encode())
-    hash_hex = hash_obj.hexdigest()[:8]
+    # Short non-cryptographic disambiguator; BLAKE2b is stdlib and faster than MD5
+    hash_hex = hashlib.blake2b(source_url.encode(), digest_size=4).hexdigest()
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     year = extract_year(source_url)
     filename = f"fama_french_6portfolios_{year}_{timestamp}_{hash_hex}.zip"
     print(f"[LOG] Generated filename: {filename}")
     return filename
 
-def get_s3_client():
-    """Returns appropriate S3 client based on environment"""
-    # Check if running in Lambda
-    if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
-        # Lambda - use IAM role only
-        print("[LOG] Using IAM role for S3 access")
-        return boto3.client('s3')
-    else:
-        # Local - use credentials if available
-        print("[LOG] Running locally, checking for credentials")
-        aws_key = os.getenv('AWS_ACCESS_KEY_ID')
-        aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
-        if aws_key and aws_secret:
-            print("[LOG] Using credentials from environment variables")
-            return boto3.client('s3', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret)
-        else:
-            print("[LOG] Using default AWS configuration")
-            return boto3.client('s3')
-
-def download_to_s3(url, bucket_name, folder_name, unique_filename, source_url):
-    s3_client = get_s3_client()
-    
+def download_to_s3(s3_client, url, bucket_name, folder_name, unique_filename, source_url):
     try:
         print(f"[LOG] Downloading from {source_url}")
         url_encoded = urllib.parse.quote(url, safe=':/?#[]@!$&\'()*+,;=')
+        s3_key = f"{folder_name}/{unique_filename}"
         with urllib.request.urlopen(url_encoded) as response:
-            file_data = response.read()
+            print(f"[LOG] Streaming {response.headers.get('Content-Length', 'unknown')} bytes")
+            s3_client.upload_fileobj(Fileobj=response, Bucket=bucket_name, Key=s3_key, Config=UPLOAD_CONFIG)
         
-        print(f"[LOG] Downloaded {len(file_data)} bytes")
-        s3_key = f"{folder_name}/{unique_filename}"
-        s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=file_data)
         print(f"[SUCCESS] Uploaded to s3://{bucket_name}/{s3_key}")
         
         # Detect if running in Lambda or locally
@@ -131,41 +147,43 @@ def download_to_s3(url, bucket_name, folder_name, unique_filename, source_url):
             "status": f"failed: {str(e)}"
         }
 
-def log_to_s3(metadata_list, bucket_name):
-    s3_client = get_s3_client()
-    
+def log_to_s3(s3_client, metadata_list, bucket_name):
     log_filename = f"ingestion_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     log_key = f"logs/download_logs/{log_filename}"
     
     print(f"[LOG] Creating ingestion log: {log_filename}")
-    csv_buffer = []
+    # csv.DictWriter quotes commas, quotes and newlines in URLs and error messages
+    csv_buffer = io.StringIO()
     if metadata_list:
-        fieldnames = metadata_list[0].keys()
-        csv_buffer.append(",".join(fieldnames))
-        for row in metadata_list:
-            csv_buffer.append(",".join(str(row[field]) for field in fieldnames))
+        writer = csv.DictWriter(csv_buffer, fieldnames=list(metadata_list[0].keys()))
+        writer.writeheader()
+        writer.writerows(metadata_list)
     
-    csv_content = "\n".join(csv_buffer)
-    s3_client.put_object(Bucket=bucket_name, Key=log_key, Body=csv_content)
+    s3_client.put_object(Bucket=bucket_name, Key=log_key, Body=csv_buffer.getvalue().encode('utf-8'))
     print(f"[SUCCESS] Logged to s3://{bucket_name}/{log_key}")
 
+def ingest_dataset(s3_client, base_url, dataset, index, total):
+    print(f"\n[PROCESSING] Dataset {index}/{total}")
+    source_url = base_url + dataset["url"]
+    unique_filename = generate_unique_filename(source_url)
+    return download_to_s3(s3_client, source_url, "dartmouth-etl", "raw_data", unique_filename, source_url)
+
 def lambda_handler(event, context):
     print("[START] Dartmouth Fama-French Data Pipeline")
     url = "https://mba.tuck.dartmouth.edu/pages/faculty/ken.french/Data_Library/six_portfolios_archive.html"
     base_url = "https://mba.tuck.dartmouth.edu/pages/faculty/ken.french/Data_Library/"
 
     datasets = fetch_datasets(url)
-    metadata_list = []
 
-    for i, dataset in enumerate(datasets, 1):
-        print(f"\n[PROCESSING] Dataset {i}/{len(datasets)}")
-        source_url = base_url + dataset["url"]
-        unique_filename = generate_unique_filename(source_url)
-        metadata = download_to_s3(source_url, "dartmouth-etl", "raw_data", unique_filename, source_url)
-        metadata_list.append(metadata)
+    # Downloads are network-bound, so overlap them on a thread pool sharing one client
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        metadata_list = list(pool.map(
+            lambda item: ingest_dataset(_S3, base_url, item[1], item[0], len(datasets)),
+            enumerate(datasets, 1)
+        ))
 
     print(f"\n[LOG] Total datasets processed: {len(metadata_list)}")
-    log_to_s3(metadata_list, "dartmouth-etl")
+    log_to_s3(_S3, metadata_list, "dartmouth-etl")
     print("[END] Pipeline completed")
     
     return {
@@ -1,23 +1,73 @@
-import boto3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.fs as pafs
 import io
-from datetime import datetime
+from itertools import chain
+import calendar
+from datetime import datetime, date
 import re
-from dateutil.relativedelta import relativedelta
 import os
 import time
+import logging
 
-# Try to load dotenv for local development, but don't fail if not available
-try:
-    from dotenv import load_dotenv
-    dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '.env')
-    load_dotenv(dotenv_path)
-    print("[LOG] Running locally with .env file")
-except ImportError:
+# Try to load dotenv for local development (never needed in Lambda)
+if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
     print("[LOG] Running in Lambda with environment variables")
+else:
+    try:
+        from dotenv import load_dotenv
+        dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '.env')
+        load_dotenv(dotenv_path)
+        print("[LOG] Running locally with .env file")
+    except ImportError:
+        print("[LOG] Running with environment variables")
 
-def get_s3_client():
-    """Returns appropriate S3 client based on environment"""
+# Per-block detail is logged at DEBUG; per-file progress stays on print
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 16
+UPLOAD_WORKERS = 8
+ATHENA_MAX_WAIT = 60
+
+# Each file worker holds at most a streaming GET and the ingestion map PUT at once
+CLIENT_CONFIG = dict(
+    max_pool_connections=2 * MAX_WORKERS,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+_S3 = None
+_ATHENA = None
+
+# Arrow S3 filesystem for parquet writes; region and endpoint are taken from boto3
+_S3FS = None
+
+# Fama-French missing-data sentinels, read as NULL by the CSV tokenizer
+MISSING_VALUES = ['-99.99', '-999.99', '-999']
+
+# Low-cardinality columns that repeat on every row of a metric parquet
+DICTIONARY_COLUMNS = ['portfolio', 'metric_type', 'ingestion_date', 'src_filename']
+
+# Matched against already-stripped lines, so no leading-whitespace scan is needed
+_DATA_ROW_RE = re.compile(rb'\d{4,6},')
+_NONWORD_RE = re.compile(r'[^\w\s-]')
+_SEP_RE = re.compile(r'[-\s]+')
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+_MONTH_RE = re.compile(r'(' + '|'.join(_MONTHS) + r')(\d{2})', re.IGNORECASE)
+FILLER_WORDS = frozenset(['the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'for'])
+
+def create_client(service_name):
+    """Returns a new client for service_name based on environment"""
+    import boto3
+    from botocore.config import Config
+    
+    config = Config(**CLIENT_CONFIG)
     is_lambda = (
         os.getenv('AWS_LAMBDA_FUNCTION_NAME') or 
         os.getenv('AWS_EXECUTION_ENV') or 
@@ -25,196 +75,208 @@ def get_s3_client():
     )
     
     if is_lambda:
-        print("[LOG] Detected Lambda environment - Using IAM role for S3 access")
-        return boto3.client('s3')
+        print(f"[LOG] Detected Lambda environment - Using IAM role for {service_name} access")
+        return boto3.client(service_name, config=config)
     else:
-        print("[LOG] Running locally, checking for credentials")
+        print(f"[LOG] Running locally, checking for {service_name} credentials")
         aws_key = os.getenv('AWS_ACCESS_KEY_ID')
         aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
         if aws_key and aws_secret:
             print("[LOG] Using credentials from environment variables")
-            return boto3.client('s3', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret)
+            return boto3.client(service_name, aws_access_key_id=aws_key, aws_secret_access_key=aws_secret, config=config)
         else:
             print("[LOG] Using default AWS configuration")
-            return boto3.client('s3')
+            return boto3.client(service_name, config=config)
+
+def get_s3_client():
+    """Returns the container's shared S3 client, creating it on first use"""
+    global _S3
+    if _S3 is None:
+        _S3 = create_client('s3')
+    return _S3
 
 def get_athena_client():
-    """Returns appropriate Athena client based on environment"""
-    is_lambda = (
-        os.getenv('AWS_LAMBDA_FUNCTION_NAME') or 
-        os.getenv('AWS_EXECUTION_ENV') or 
-        os.getenv('LAMBDA_TASK_ROOT')
-    )
-    
-    if is_lambda:
-        return boto3.client('athena')
-    else:
-        aws_key = os.getenv('AWS_ACCESS_KEY_ID')
-        aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
-        if aws_key and aws_secret:
-            return boto3.client('athena', aws_access_key_id=aws_key, aws_secret_access_key=aws_secret)
-        else:
-            return boto3.client('athena')
+    """Returns the container's shared Athena client, creating it on first use"""
+    global _ATHENA
+    if _ATHENA is None:
+        _ATHENA = create_client('athena')
+    return _ATHENA
+
+def get_s3_filesystem(s3_client, bucket_name):
+    """Returns the container's shared Arrow S3 filesystem, creating it on first use"""
+    global _S3FS
+    if _S3FS is None:
+        # Arrow does not follow bucket-region redirects, so ask S3 (via boto3) where the bucket lives
+        headers = s3_client.head_bucket(Bucket=bucket_name)['ResponseMetadata']['HTTPHeaders']
+        _S3FS = pafs.S3FileSystem(
+            region=headers.get('x-amz-bucket-region', s3_client.meta.region_name),
+            endpoint_override=os.getenv('AWS_ENDPOINT_URL_S3') or os.getenv('AWS_ENDPOINT_URL'),
+            retry_strategy=pafs.AwsDefaultS3RetryStrategy(max_attempts=5)
+        )
+    return _S3FS
 
 def clean_metric_name(text):
     """Convert metric description to clean snake_case name"""
     text = text.lower().strip()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '_', text)
+    text = _NONWORD_RE.sub('', text)
+    text = _SEP_RE.sub('_', text)
     
-    filler_words = ['the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'for']
     words = text.split('_')
-    words = [w for w in words if w not in filler_words and w]
+    words = [w for w in words if w not in FILLER_WORDS and w]
     
     return '_'.join(words)
 
-def parse_csv_blocks(csv_content, src_filename):
-    """Parse Fama-French CSV into dynamic blocks"""
-    lines = csv_content.decode('utf-8').split('\n')
-    
-    print(f"[LOG] Total lines in file: {len(lines)}")
-    
+def parse_csv_blocks(lines, src_filename):
+    """Parse Fama-French CSV lines (bytes) into dynamic blocks"""
     blocks = []
-    i = 0
-    block_count = 0
-    
-    while i < len(lines):
-        metric_description = None
-        
-        while i < len(lines) and not lines[i].startswith(',SMALL'):
-            line = lines[i].strip()
-            if line and not re.match(r'^\s*\d{4,6},', lines[i]):
-                metric_description = line
-            i += 1
-        
-        if i >= len(lines):
-            break
-        
-        header_row = lines[i].strip()
-        cols = [col.strip() for col in header_row.split(',')]
-        cols[0] = 'DATE'
-        
-        if metric_description:
-            metric_type = clean_metric_name(metric_description)
-        else:
-            metric_type = f'metric_{block_count + 1}'
-        
-        print(f"[LOG] Block {block_count + 1}: {metric_type}")
-        print(f"[LOG] Description: {metric_description}")
-        print(f"[LOG] Header at line {i}: {cols}")
-        i += 1
+    metric_description = None
+    block = None
+    start_line = 0
+    line_num = 0
+    
+    # Last text line before a header is the description; a blank line (or EOF) ends the block
+    for line_num, line in enumerate(chain(lines, [b''])):
+        stripped = line.strip()
         
-        data_rows = []
-        start_line = i
-        while i < len(lines):
-            line = lines[i].strip()
+        if block is not None:
+            if stripped:
+                if _DATA_ROW_RE.match(stripped):
+                    block['data_rows'].append(stripped)
+                continue
             
-            if line == '':
-                break
+            logger.debug("Block %d data rows: %d (lines %d to %d)", block['block_num'], len(block['data_rows']), start_line, line_num - 1)
             
-            if re.match(r'^\s*\d{4,6},', lines[i]):
-                data_rows.append(lines[i].strip())
+            if block['data_rows']:
+                blocks.append(block)
+            else:
+                print(f"[WARN] Block at line {start_line} has no data rows, skipping")
             
-            i += 1
-        
-        print(f"[LOG] Block {block_count + 1} data rows: {len(data_rows)} (lines {start_line} to {i-1})")
+            block = None
+            metric_description = None
         
-        if data_rows:
-            blocks.append({
+        elif line.startswith(b',SMALL'):
+            cols = [col.strip() for col in stripped.decode('utf-8').split(',')]
+            cols[0] = 'DATE'
+            
+            if metric_description:
+                metric_type = clean_metric_name(metric_description)
+            else:
+                metric_type = f'metric_{len(blocks) + 1}'
+            
+            logger.debug("Block %d: %s (%r), header at line %d: %s", len(blocks) + 1, metric_type, metric_description, line_num, cols)
+            
+            start_line = line_num + 1
+            block = {
                 'metric_type': metric_type,
                 'metric_description': metric_description,
                 'columns': cols,
-                'data_rows': data_rows,
+                'data_rows': [],
                 'src_filename': src_filename,
-                'block_num': block_count + 1
-            })
-            block_count += 1
-            print(f"[LOG] Block {block_count} saved successfully")
-        else:
-            print(f"[WARN] Block at line {start_line} has no data rows, skipping")
+                'block_num': len(blocks) + 1
+            }
+        
+        elif stripped and not _DATA_ROW_RE.match(stripped):
+            metric_description = stripped.decode('utf-8')
     
-    print(f"[LOG] Total blocks parsed: {len(blocks)}")
+    print(f"[LOG] Parsed {len(blocks)} blocks from {line_num} lines of {src_filename}")
     return blocks
 
 def parse_ingestion_date(filename):
     """Extract date from filename like july17 -> 2017-07-31"""
-    months = {
-        'january': 1, 'february': 2, 'march': 3, 'april': 4,
-        'may': 5, 'june': 6, 'july': 7, 'august': 8,
-        'september': 9, 'october': 10, 'november': 11, 'december': 12
-    }
-    
-    filename_lower = filename.lower()
-    
-    for month_name, month_num in months.items():
-        if month_name in filename_lower:
-            year_match = re.search(r'(\d{2})', filename_lower)
-            if year_match:
-                year = int(year_match.group(1))
-                full_year = 1900 + year if year > 50 else 2000 + year
-                
-                if full_year < 2017:
-                    print(f"[WARN] File {filename} is before 2017 (year={full_year}), skipping")
-                    return None
-                
-                date = datetime(full_year, month_num, 1)
-                date = date + relativedelta(months=1) - relativedelta(days=1)
-                return date.date()
+    match = _MONTH_RE.search(filename)
+    
+    if match:
+        year = int(match.group(2))
+        full_year = 1900 + year if year > 50 else 2000 + year
+        
+        if full_year < 2017:
+            print(f"[WARN] File {filename} is before 2017 (year={full_year}), skipping")
+            return None
+        
+        month_num = _MONTHS[match.group(1).lower()]
+        return date(full_year, month_num, calendar.monthrange(full_year, month_num)[1])
     
     print(f"[WARN] Could not extract date from filename: {filename}")
     return None
 
 def blocks_to_parquets(blocks, src_filename):
-    """Convert blocks to separate parquet dataframes"""
+    """Convert blocks to Arrow tables, one per metric, sliced from a single file-wide table"""
     ingestion_date = parse_ingestion_date(src_filename)
     
     if ingestion_date is None:
         print("[WARN] File before 2017 or invalid filename, skipping")
         return {}
     
-    parquets = {}
+    # One file-wide table with shared dictionaries; each metric is a slice of it
+    portfolio_codes = {}
+    header_codes = {}
+    metric_names = []
+    dates, portfolios, metrics, values = [], [], [], []
+    spans = []
+    offset = 0
     
     for block in blocks:
         metric_type = block['metric_type']
-        columns = block['columns']
-        
-        portfolio_names = [col.lower().replace(' ', '_') for col in columns[1:]]
-        
-        data = []
-        for row in block['data_rows']:
-            parts = row.split(',')
-            date_val = parts[0].strip()
-            values = parts[1:]
-            
-            for portfolio_name, val in zip(portfolio_names, values):
-                try:
-                    val_float = float(val.strip()) if val and val.strip() else None
-                except Exception as e:
-                    print(f"[WARN] Could not parse value '{val}' for {date_val}/{portfolio_name}: {e}")
-                    val_float = None
-                
-                data.append({
-                    'date_format': date_val,
-                    'portfolio': portfolio_name,
-                    'metric_type': metric_type,
-                    'value': val_float,
-                    'ingestion_date': ingestion_date,
-                    'src_filename': src_filename
-                })
+        header = tuple(block['columns'][1:])
+        n_rows = len(block['data_rows'])
+        n_ports = len(header)
         
-        if len(data) == 0:
+        if n_rows == 0 or n_ports == 0:
             print(f"[WARN] No data for metric {metric_type}, skipping")
             continue
-            
-        df = pd.DataFrame(data)
-        df = df[['date_format', 'portfolio', 'metric_type', 'value', 'ingestion_date', 'src_filename']]
-        print(f"[LOG] {metric_type}: DataFrame has {len(df)} rows")
-        parquets[metric_type] = df
+        
+        if header not in header_codes:
+            header_codes[header] = np.array(
+                [portfolio_codes.setdefault(col.lower().replace(' ', '_'), len(portfolio_codes)) for col in header],
+                dtype=np.int16
+            )
+        
+        # Missing-data sentinels become NULL
+        wide = pd.read_csv(
+            io.BytesIO(b'\n'.join(block['data_rows'])),
+            header=None,
+            names=range(n_ports + 1),
+            usecols=range(n_ports + 1),
+            dtype={0: str},
+            skipinitialspace=True,
+            na_values=MISSING_VALUES
+        )
+        cells = wide.iloc[:, 1:].to_numpy().ravel()
+        
+        n_values = n_rows * n_ports
+        dates.append(np.repeat(wide[0].str.strip().to_numpy(dtype=object), n_ports))
+        portfolios.append(np.tile(header_codes[header], n_rows))
+        metrics.append(np.full(n_values, len(metric_names), dtype=np.int16))
+        values.append(pd.to_numeric(cells, errors='coerce').astype(np.float64))
+        metric_names.append(metric_type)
+        
+        spans.append((metric_type, offset, n_values))
+        offset += n_values
+        logger.debug("%s: table has %d rows", metric_type, n_values)
     
-    return parquets
+    if not spans:
+        return {}
+    
+    table = pa.table({
+        'date_format': pa.array(np.concatenate(dates), type=pa.string()),
+        'portfolio': pa.DictionaryArray.from_arrays(
+            np.concatenate(portfolios),
+            pa.array(list(portfolio_codes), type=pa.string())
+        ),
+        'metric_type': pa.DictionaryArray.from_arrays(
+            np.concatenate(metrics),
+            pa.array(metric_names, type=pa.string())
+        ),
+        'value': pa.array(np.concatenate(values), type=pa.float64(), from_pandas=True),
+        'ingestion_date': pa.repeat(pa.scalar(ingestion_date, type=pa.date32()), offset),
+        'src_filename': pa.repeat(pa.scalar(src_filename, type=pa.string()), offset)
+    })
+    
+    # A repeated metric name keeps its last block, as before
+    return {metric_type: table.slice(start, length) for metric_type, start, length in spans}
 
 def execute_athena_query(athena_client, query, database='dartmouth_db'):
-    """Execute Athena query and return results"""
+    """Execute Athena query and return all result rows (header row first)"""
     output_location = 's3://dartmouth-etl/athena-results/'
     
     print(f"[LOG] Executing Athena query: {query}")
@@ -228,9 +290,10 @@ def execute_athena_query(athena_client, query, database='dartmouth_db'):
     query_execution_id = response['QueryExecutionId']
     print(f"[LOG] Query execution ID: {query_execution_id}")
     
-    # Wait for query to complete
-    max_attempts = 30
-    for attempt in range(max_attempts):
+    # Wait for query to complete, polling quickly at first and backing off
+    delay = 0.2
+    waited = 0.0
+    while True:
         response = athena_client.get_query_execution(QueryExecutionId=query_execution_id)
         status = response['QueryExecution']['Status']['State']
         
@@ -242,32 +305,36 @@ def execute_athena_query(athena_client, query, database='dartmouth_db'):
             print(f"[ERROR] Query {status}: {reason}")
             return None
         
-        time.sleep(2)
+        if waited >= ATHENA_MAX_WAIT:
+            print(f"[ERROR] Query still {status} after {waited:.0f}s, giving up")
+            return None
+        
+        time.sleep(delay)
+        waited += delay
+        delay = min(delay * 2, 2)
     
     # Get results
-    result = athena_client.get_query_results(QueryExecutionId=query_execution_id)
-    return result
+    paginator = athena_client.get_paginator('get_query_results')
+    return [row for page in paginator.paginate(QueryExecutionId=query_execution_id) for row in page['ResultSet']['Rows']]
 
-def check_if_already_processed(athena_client, src_filename):
-    """Check if file already processed using Athena table"""
-    query = f"""
-    SELECT COUNT(*) as count 
+def fetch_processed_filenames(athena_client):
+    """Return the set of source files already logged as successfully processed"""
+    query = """
+    SELECT DISTINCT src_filename 
     FROM dartmouth_db.data_ingestion_map 
-    WHERE src_filename = '{src_filename}' 
-    AND status = 'success'
+    WHERE status = 'success'
     """
     
-    result = execute_athena_query(athena_client, query)
+    rows = execute_athena_query(athena_client, query)
     
-    if result and 'ResultSet' in result:
-        rows = result['ResultSet']['Rows']
-        if len(rows) > 1:  # Skip header row
-            count = int(rows[1]['Data'][0]['VarCharValue'])
-            if count > 0:
-                print(f"[INFO] File {src_filename} already processed ({count} records found)")
-                return True
+    if not rows:
+        return set()
     
-    return False
+    # Skip header row
+    processed = {row['Data'][0].get('VarCharValue') for row in rows[1:] if row['Data']}
+    processed.discard(None)
+    print(f"[LOG] {len(processed)} files already processed")
+    return processed
 
 def log_to_ingestion_map(s3_client, src_filename, ingestion_date, parquet_files):
     """Log processing metadata to ingestion map table"""
@@ -307,7 +374,71 @@ def log_to_ingestion_map(s3_client, src_filename, ingestion_date, parquet_files)
     s3_client.put_object(Bucket=bucket_name, Key=map_key, Body=parquet_buffer.getvalue())
     print(f"[SUCCESS] Logged to ingestion map")
 
+def upload_parquet(s3_fs, bucket_name, s3_key, table):
+    """Write one metric table as parquet straight to S3 and return its key"""
+    print(f"[LOG] Uploading {s3_key} ({table.num_rows} rows)")
+    with s3_fs.open_output_stream(f"{bucket_name}/{s3_key}") as out:
+        pq.write_table(
+            table, out,
+            use_dictionary=DICTIONARY_COLUMNS, compression='zstd', compression_level=3
+        )
+    print(f"[SUCCESS] {s3_key.split('/')[-1]}")
+    return s3_key
+
+def process_csv_file(s3_client, s3_fs, processed, bucket_name, output_folder, csv_key):
+    """Parse one CSV into per-metric parquets; returns (uploaded keys, whether it was skipped)"""
+    print(f"\n[LOG] Processing {csv_key}")
+    
+    file_parquets = []
+    
+    try:
+        filename = csv_key.split('/')[-1]
+        
+        if filename in processed:
+            print(f"[INFO] File {filename} already processed")
+            return file_parquets, True
+        
+        # Stream the CSV and parse blocks as lines arrive, keeping only block data in memory
+        response = s3_client.get_object(Bucket=bucket_name, Key=csv_key)
+        blocks = parse_csv_blocks(response['Body'].iter_lines(chunk_size=1 << 20), filename)
+        
+        if len(blocks) == 0:
+            print("[WARN] No blocks found, skipping")
+            return file_parquets, False
+        
+        # Convert to parquets
+        parquets = blocks_to_parquets(blocks, filename)
+        
+        if not parquets:
+            print("[WARN] No parquets generated, skipping")
+            return file_parquets, False
+        
+        # Get ingestion date for logging
+        ingestion_date = parse_ingestion_date(filename)
+        
+        # Upload parquets, one metric per worker
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            uploads = [
+                pool.submit(
+                    upload_parquet, s3_fs, bucket_name,
+                    f"{output_folder}/{filename.replace('.CSV', '')}_{metric_type}.parquet", table
+                )
+                for metric_type, table in parquets.items()
+            ]
+            file_parquets.extend(upload.result() for upload in uploads)
+        
+        # Log to ingestion map
+        log_to_ingestion_map(s3_client, filename, ingestion_date, file_parquets)
+            
+    except Exception as e:
+        print(f"[ERROR] Failed to process {csv_key}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+    
+    return file_parquets, False
+
 def lambda_handler(event, context):
+    logging.getLogger().setLevel(logging.INFO)
     s3_client = get_s3_client()
     athena_client = get_athena_client()
     
@@ -338,65 +469,23 @@ def lambda_handler(event, context):
         
         print(f"[LOG] Found {len(csv_files)} CSV files")
         
+        # One Athena query covers every file instead of one per file
+        processed = fetch_processed_filenames(athena_client)
+        s3_fs = get_s3_filesystem(s3_client, bucket_name)
+        
         all_parquets = []
         skipped_count = 0
         
-        for csv_key in csv_files:
-            print(f"\n[LOG] Processing {csv_key}")
-            
-            try:
-                filename = csv_key.split('/')[-1]
-                
-                # Check if already processed using Athena
-                if check_if_already_processed(athena_client, filename):
-                    skipped_count += 1
-                    continue
-                
-                # Download CSV
-                response = s3_client.get_object(Bucket=bucket_name, Key=csv_key)
-                csv_content = response['Body'].read()
-                
-                # Parse blocks
-                blocks = parse_csv_blocks(csv_content, filename)
-                print(f"[LOG] Parsed {len(blocks)} blocks")
-                
-                if len(blocks) == 0:
-                    print("[WARN] No blocks found, skipping")
-                    continue
-                
-                # Convert to parquets
-                parquets = blocks_to_parquets(blocks, filename)
-                
-                if not parquets:
-                    print("[WARN] No parquets generated, skipping")
-                    continue
-                
-                # Get ingestion date for logging
-                ingestion_date = parse_ingestion_date(filename)
-                file_parquets = []
-                
-                # Upload parquets
-                for metric_type, df in parquets.items():
-                    s3_key = f"{output_folder}/{filename.replace('.CSV', '')}_{metric_type}.parquet"
-                    
-                    print(f"[LOG] Uploading {s3_key} ({len(df)} rows)")
-                    parquet_buffer = io.BytesIO()
-                    df.to_parquet(parquet_buffer, index=False)
-                    parquet_buffer.seek(0)
-                    
-                    s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=parquet_buffer.getvalue())
-                    all_parquets.append(s3_key)
-                    file_parquets.append(s3_key)
-                    print(f"[SUCCESS] {metric_type}")
-                
-                # Log to ingestion map
-                log_to_ingestion_map(s3_client, filename, ingestion_date, file_parquets)
-                    
-            except Exception as e:
-                print(f"[ERROR] Failed to process {csv_key}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
+        # Process files concurrently; boto3 clients are thread-safe and shared
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(csv_files))) as pool:
+            futures = [
+                pool.submit(process_csv_file, s3_client, s3_fs, processed, bucket_name, output_folder, csv_key)
+                for csv_key in csv_files
+            ]
+            for future in as_completed(futures):
+                file_parquets, skipped = future.result()
+                all_parquets.extend(file_parquets)
+                skipped_count += skipped
         
         print(f"\n[SUMMARY] Created {len(all_parquets)} parquet files, skipped {skipped_count} already processed")
         return {